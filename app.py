@@ -9,6 +9,9 @@ from dotenv import load_dotenv
 import soundfile as sf
 import io
 
+from src.utils.audio_processor import AudioProcessor
+from src.utils.model_registry import ModelRegistry, HotSwapModel
+
 
 load_dotenv()
 
@@ -19,6 +22,25 @@ CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
 
+audio_processor = AudioProcessor('config/config.yaml')
+config = audio_processor.config
+
+
+def load_model(model_path):
+    
+    import tensorflow as tf
+    
+    
+    return tf.keras.models.load_model(model_path, compile=False)
+
+model_registry = ModelRegistry(config['model_dir'])
+model_server = HotSwapModel(model_registry, load_model)
+
+
+if __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+    model_server.start()
+
+
 
 
 
@@ -26,7 +48,12 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 @app.route('/')
 def index():
     
-    return render_template('index.html')
+    return render_template(
+        'index.html',
+        sample_rate=config['sample_rate'],
+        upload_format=config.get('upload_format', 'media'),
+        max_upload_duration=config['max_upload_duration']
+    )
 
 @app.route('/analyze', methods=['POST'])
 def analyze_audio():
@@ -38,34 +65,67 @@ def analyze_audio():
         if not audio_data:
             return jsonify({'error': 'No audio data provided'}), 400
         
+        if not model_server.is_ready():
+            return jsonify({'error': 'No model loaded'}), 503
         
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-            audio_data.save(temp_audio.name)
-            
-            
-            
+        
+        if request.form.get('format') == 'pcm16':
+            max_bytes = int(config['max_upload_duration'] * config['sample_rate']) * 2
+            pcm = audio_data.read(max_bytes)
+            sample_rate = request.form.get('sample_rate', type=int)
             
+            if sample_rate != config['sample_rate']:
+                return jsonify({'error': f"PCM audio must be sampled at {config['sample_rate']} Hz"}), 400
             
-            result = {
-                'success': True,
-                'predicted_emotion': 'happy',  
-                'confidence': 0.87,  
-                'all_predictions': [
-                    {'emotion': 'happy', 'confidence': 0.87},
-                    {'emotion': 'neutral', 'confidence': 0.10},
-                    {'emotion': 'sad', 'confidence': 0.02},
-                    {'emotion': 'angry', 'confidence': 0.01}
-                ]
-            }
+            if not pcm or len(pcm) % 2:
+                return jsonify({'error': 'Malformed PCM audio data'}), 400
             
+            spectrogram = audio_processor.process_pcm16(pcm)
+        else:
+            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
+                audio_data.save(temp_audio.name)
             
+            spectrogram = audio_processor.process_file(temp_audio.name)
             os.unlink(temp_audio.name)
-            
-            return jsonify(result)
+        
+        if spectrogram is None:
+            return jsonify({'error': 'Failed to process audio data'}), 400
+        
+        
+        
+        
+        
+        model_version, class_names, predictions = model_server.predict(np.expand_dims(spectrogram, axis=0))
+        
+        all_predictions = [
+            {'emotion': emotion, 'confidence': float(confidence)}
+            for emotion, confidence in zip(class_names, predictions[0])
+        ]
+        all_predictions.sort(key=lambda x: x['confidence'], reverse=True)
+        
+        result = {
+            'success': True,
+            'predicted_emotion': all_predictions[0]['emotion'],
+            'confidence': all_predictions[0]['confidence'],
+            'all_predictions': all_predictions,
+            'model_version': model_version
+        }
+        
+        return jsonify(result)
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/model', methods=['GET'])
+def model_status():
+    
+    return jsonify({
+        'model_version': model_server.version,
+        'class_names': model_server.class_names,
+        'active_version': model_registry.current_version(),
+        'available_versions': model_registry.list_versions()
+    })
+
 @socketio.on('start_recording')
 def handle_start_recording():
     
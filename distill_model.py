@@ -0,0 +1,425 @@
+import os
+import sys
+import json
+import time
+import subprocess
+import argparse
+import yaml
+import numpy as np
+import tensorflow as tf
+
+
+from src.models.crnn import CRNN
+from train_model import EmotionTrainer
+
+class Distiller(tf.keras.Model):
+    def __init__(self, student, teacher, temperature=4.0, alpha=0.7):
+        super().__init__()
+
+        self.student = student
+        self.teacher = teacher
+        self.temperature = temperature
+        self.alpha = alpha
+
+
+        self.student_loss_fn = tf.keras.losses.CategoricalCrossentropy()
+        self.distillation_loss_fn = tf.keras.losses.KLDivergence()
+        self.loss_tracker = tf.keras.metrics.Mean(name='loss')
+        self.accuracy_tracker = tf.keras.metrics.CategoricalAccuracy(name='accuracy')
+
+    @property
+    def metrics(self):
+        return [self.loss_tracker, self.accuracy_tracker]
+
+    def call(self, x, training=False):
+        return self.student(x, training=training)
+
+    def _soften(self, probabilities):
+
+
+        logits = tf.math.log(tf.clip_by_value(probabilities, 1e-7, 1.0))
+        return tf.nn.softmax(logits / self.temperature, axis=-1)
+
+    def _compute_loss(self, y, student_pred, teacher_pred, sample_weight=None):
+
+        student_loss = self.student_loss_fn(y, student_pred, sample_weight=sample_weight)
+        distillation_loss = self.distillation_loss_fn(
+            self._soften(teacher_pred),
+            self._soften(student_pred),
+            sample_weight=sample_weight
+        ) * (self.temperature ** 2)
+
+        return self.alpha * distillation_loss + (1 - self.alpha) * student_loss
+
+    def train_step(self, data):
+
+        x, y, sample_weight = tf.keras.utils.unpack_x_y_sample_weight(data)
+        teacher_pred = self.teacher(x, training=False)
+
+        with tf.GradientTape() as tape:
+            student_pred = self.student(x, training=True)
+            loss = self._compute_loss(y, student_pred, teacher_pred, sample_weight)
+
+        gradients = tape.gradient(loss, self.student.trainable_variables)
+        self.optimizer.apply_gradients(zip(gradients, self.student.trainable_variables))
+
+        self.loss_tracker.update_state(loss)
+        self.accuracy_tracker.update_state(y, student_pred)
+        return {m.name: m.result() for m in self.metrics}
+
+    def test_step(self, data):
+
+        x, y, sample_weight = tf.keras.utils.unpack_x_y_sample_weight(data)
+        student_pred = self.student(x, training=False)
+        loss = self._compute_loss(y, student_pred, self.teacher(x, training=False), sample_weight)
+
+        self.loss_tracker.update_state(loss)
+        self.accuracy_tracker.update_state(y, student_pred)
+        return {m.name: m.result() for m in self.metrics}
+
+class ModelCompressor(EmotionTrainer):
+    def __init__(self, config_path='config/config.yaml', teacher_path=None):
+        super().__init__(config_path)
+
+        self.distill_config = self.config['distillation']
+
+
+        self.teacher_architecture = {
+            key: self.config[key] for key in ('conv_filters', 'lstm_units', 'dense_units')
+        }
+        if teacher_path is None:
+            version = self.registry.current_version()
+            if version is None:
+                raise FileNotFoundError("No active model version to use as the teacher")
+            teacher_path = self.registry.model_path(version)
+
+
+            self.teacher_architecture = self.registry.metadata(version).get(
+                'architecture', self.teacher_architecture
+            )
+
+        self.model.load(teacher_path)
+        self.teacher = self.model.model
+        self.teacher.trainable = False
+        print(f"Teacher loaded from {teacher_path}")
+
+    def build_student(self, run_dir, name, overrides):
+
+
+        student_config = dict(self.config)
+        student_config.update(overrides)
+
+        student_config_path = os.path.join(run_dir, f"{name}.yaml")
+        with open(student_config_path, 'w') as f:
+            yaml.safe_dump(student_config, f)
+
+        return CRNN(student_config_path)
+
+    def distill(self, student, train_data, val_data, epochs):
+
+        X_train, y_train = train_data
+
+        distiller = Distiller(
+            student=student.model,
+            teacher=self.teacher,
+            temperature=self.distill_config['temperature'],
+            alpha=self.distill_config['alpha']
+        )
+        distiller.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=self.config['learning_rate'])
+        )
+
+        callbacks = [
+            tf.keras.callbacks.EarlyStopping(
+                monitor='val_accuracy',
+                mode='max',
+                patience=10,
+                restore_best_weights=True,
+                verbose=1
+            ),
+            tf.keras.callbacks.ReduceLROnPlateau(
+                monitor='val_loss',
+                factor=0.5,
+                patience=3,
+                min_lr=1e-6,
+                verbose=1
+            )
+        ]
+
+        distiller.fit(
+            X_train, y_train,
+            batch_size=self.config['batch_size'],
+            epochs=epochs,
+            validation_data=val_data,
+            callbacks=callbacks,
+            class_weight=self._calculate_class_weights(y_train),
+            verbose=1
+        )
+
+        return student
+
+    def prune_channels(self, run_dir, name, source, architecture, ratio):
+
+
+        pruned_architecture = dict(architecture)
+        pruned_architecture['conv_filters'] = [
+            max(1, int(round(n * (1 - ratio)))) for n in architecture['conv_filters']
+        ]
+        pruned = self.build_student(run_dir, name, pruned_architecture)
+
+        if len(source.model.layers) != len(pruned.model.layers):
+            raise ValueError(f"Cannot prune '{name}': pruned model has a different layer structure")
+
+
+        keep = None
+        channels = None
+        reinitialized = []
+        for src_layer, dst_layer in zip(source.model.layers, pruned.model.layers):
+            if type(src_layer) is not type(dst_layer):
+                raise ValueError(f"Cannot prune '{name}': layer {src_layer.name} does not match {dst_layer.name}")
+
+            weights = src_layer.get_weights()
+            if not weights:
+                continue
+
+            if isinstance(src_layer, tf.keras.layers.Conv2D):
+                kernel = weights[0]
+                if keep is not None:
+                    kernel = kernel[:, :, keep, :]
+
+
+                n_keep = dst_layer.get_weights()[0].shape[-1]
+                importance = np.abs(kernel).sum(axis=(0, 1, 2))
+                keep = np.sort(np.argsort(importance)[::-1][:n_keep])
+                channels = kernel.shape[-1]
+
+                dst_layer.set_weights([kernel[..., keep]] + [w[keep] for w in weights[1:]])
+            elif isinstance(src_layer, tf.keras.layers.BatchNormalization) and keep is not None \
+                    and weights[0].shape[0] == channels:
+                dst_layer.set_weights([w[keep] for w in weights])
+            elif keep is not None:
+                # First layer after the conv stack (the LSTM): the conv output is flattened
+                # channels-last, so input row h * channels + c belongs to channel c.
+                # Keeping the rows of surviving channels carries the learned weights over.
+                inputs = weights[0].shape[0]
+                rows = np.concatenate([h * channels + keep for h in range(inputs // channels)]) \
+                    if inputs % channels == 0 else None
+
+                sliced = []
+                for w, d in zip(weights, dst_layer.get_weights()):
+                    if w.shape == d.shape:
+                        sliced.append(w)
+                    elif rows is not None and w.shape[0] == inputs and (len(rows),) + w.shape[1:] == d.shape:
+                        sliced.append(w[rows])
+                    else:
+                        sliced.append(d)
+                        if dst_layer.name not in reinitialized:
+                            reinitialized.append(dst_layer.name)
+                dst_layer.set_weights(sliced)
+                keep = None
+            elif [w.shape for w in weights] == [w.shape for w in dst_layer.get_weights()]:
+                dst_layer.set_weights(weights)
+            else:
+                reinitialized.append(dst_layer.name)
+
+        if reinitialized:
+            print(f"Warning: could not carry weights over to {reinitialized} in '{name}'; "
+                  f"these layers start from random initialisation")
+
+        return pruned, pruned_architecture, reinitialized
+
+    def evaluate_candidate(self, run_dir, name, model, architecture, X_test, y_test, reinitialized=None):
+
+        model_path = os.path.join(run_dir, f"{name}.h5")
+        model.save(model_path)
+
+        predictions = model.model.predict(X_test, batch_size=self.config['batch_size'], verbose=0)
+        accuracy = float(np.mean(np.argmax(predictions, axis=1) == np.argmax(y_test, axis=1)))
+        latency_p50, latency_p95 = measure_cpu_latency(model_path, self.distill_config['latency_runs'])
+
+        candidate = {
+            'name': name,
+            'architecture': architecture,
+            'path': model_path,
+            'accuracy': accuracy,
+            'latency_p50_ms': latency_p50,
+            'latency_p95_ms': latency_p95,
+            'size_bytes': os.path.getsize(model_path),
+            'params': int(model.model.count_params())
+        }
+        if reinitialized:
+            candidate['reinitialized_layers'] = reinitialized
+        print(f"{name}: accuracy {accuracy:.4f}, p50 {latency_p50:.2f} ms, "
+              f"{candidate['size_bytes'] / 1e6:.2f} MB")
+
+        return candidate
+
+    def compress(self, X, y):
+
+        print("\nStarting model compression...")
+
+        run_dir = self._create_run_dir()
+        train_data, val_data, (X_test, y_test) = self.split_dataset(X, y)
+
+
+        candidates = [self.evaluate_candidate(
+            run_dir, 'teacher', self.model, self.teacher_architecture, X_test, y_test
+        )]
+
+        for student_spec in self.distill_config['students']:
+            architecture = dict(student_spec)
+            name = architecture.pop('name')
+
+            print(f"\nDistilling student '{name}'...")
+            student = self.build_student(run_dir, name, architecture)
+            student.summary()
+            self.distill(student, train_data, val_data, self.distill_config['epochs'])
+            candidates.append(self.evaluate_candidate(run_dir, name, student, architecture, X_test, y_test))
+
+            for ratio in self.distill_config.get('prune_ratios', []):
+                pruned_name = f"{name}-pruned{int(ratio * 100)}"
+
+                print(f"\nPruning {ratio:.0%} of conv channels from '{name}' and fine-tuning...")
+                pruned, pruned_architecture, reinitialized = self.prune_channels(
+                    run_dir, pruned_name, student, architecture, ratio
+                )
+                self.distill(pruned, train_data, val_data, self.distill_config['fine_tune_epochs'])
+                candidates.append(self.evaluate_candidate(
+                    run_dir, pruned_name, pruned, pruned_architecture, X_test, y_test, reinitialized
+                ))
+
+
+        report = pareto_report(candidates, self.distill_config.get('latency_budget_ms'))
+        report_path = os.path.join(run_dir, 'pareto_report.json')
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print_report(report)
+        print(f"\nReport saved to {report_path}")
+
+        return report
+
+def measure_cpu_latency(model_path, runs=50):
+
+
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__),
+         '--measure-latency', model_path, '--latency-runs', str(runs)],
+        env=dict(os.environ, CUDA_VISIBLE_DEVICES=''),
+        text=True
+    )
+    result = json.loads(output.strip().splitlines()[-1])
+    return result['p50_ms'], result['p95_ms']
+
+def time_serving_predict(model_path, runs=50, warmup=5):
+
+
+    model = tf.keras.models.load_model(model_path, compile=False)
+    shape = [1 if dim is None else dim for dim in model.input_shape]
+    x = np.random.rand(*shape).astype(np.float32)
+
+    for _ in range(warmup):
+        model.predict(x, verbose=0)
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.predict(x, verbose=0)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {'p50_ms': float(np.percentile(timings, 50)), 'p95_ms': float(np.percentile(timings, 95))}
+
+def pareto_report(candidates, latency_budget_ms=None):
+
+    def dominates(a, b):
+        no_worse = (a['accuracy'] >= b['accuracy'] and
+                    a['latency_p95_ms'] <= b['latency_p95_ms'] and
+                    a['size_bytes'] <= b['size_bytes'])
+        better = (a['accuracy'] > b['accuracy'] or
+                  a['latency_p95_ms'] < b['latency_p95_ms'] or
+                  a['size_bytes'] < b['size_bytes'])
+        return no_worse and better
+
+    for candidate in candidates:
+        candidate['pareto_optimal'] = not any(
+            dominates(other, candidate) for other in candidates if other is not candidate
+        )
+
+
+    recommended = None
+    if latency_budget_ms is not None:
+        within_budget = [c for c in candidates if c['latency_p95_ms'] <= latency_budget_ms]
+        if within_budget:
+            recommended = min(
+                within_budget, key=lambda c: (-c['accuracy'], c['latency_p95_ms'], c['size_bytes'])
+            )['name']
+
+    return {
+        'latency_budget_ms': latency_budget_ms,
+        'recommended': recommended,
+        'candidates': sorted(candidates, key=lambda c: c['latency_p50_ms'])
+    }
+
+def print_report(report):
+
+    print("\nAccuracy / CPU latency / size (* = Pareto-optimal):")
+    print(f"  {'model':<24}{'accuracy':>10}{'p50 ms':>10}{'p95 ms':>10}{'size MB':>10}{'params':>12}")
+    for c in report['candidates']:
+        marker = '*' if c['pareto_optimal'] else ' '
+        print(f"{marker} {c['name']:<24}{c['accuracy']:>10.4f}{c['latency_p50_ms']:>10.2f}"
+              f"{c['latency_p95_ms']:>10.2f}{c['size_bytes'] / 1e6:>10.2f}{c['params']:>12}")
+
+    if report['latency_budget_ms'] is not None:
+        print(f"\nRecommended within {report['latency_budget_ms']} ms p95: "
+              f"{report['recommended'] or 'none'}")
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Distill and prune the emotion model for CPU serving')
+    parser.add_argument('--teacher', type=str, help='Path to the teacher model (default: active version)')
+    parser.add_argument('--config', type=str, default='config/config.yaml',
+                       help='Path to the config file')
+    parser.add_argument('--publish', type=str,
+                       help='Publish the named candidate to the model registry without activating it')
+    parser.add_argument('--measure-latency', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--latency-runs', type=int, default=50, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+
+    if args.measure_latency:
+        print(json.dumps(time_serving_predict(args.measure_latency, args.latency_runs)))
+        return
+
+
+    physical_devices = tf.config.list_physical_devices('GPU')
+    if physical_devices:
+        try:
+            for device in physical_devices:
+                tf.config.experimental.set_memory_growth(device, True)
+            print("GPU memory growth enabled")
+        except RuntimeError as e:
+            print(f"Error setting GPU memory growth: {e}")
+
+
+    compressor = ModelCompressor(config_path=args.config, teacher_path=args.teacher)
+
+
+    X, y = compressor.load_dataset(compressor.config['data_dir'])
+    report = compressor.compress(X, y)
+
+
+    if args.publish:
+        candidate = next((c for c in report['candidates'] if c['name'] == args.publish), None)
+        if candidate is None:
+            print(f"Unknown candidate: {args.publish}")
+            return
+
+        metadata = {k: v for k, v in candidate.items() if k != 'path'}
+        metadata['class_names'] = [str(c) for c in compressor.label_encoder.classes_]
+
+        version = compressor.registry.publish(candidate['path'], metadata=metadata, activate=False)
+        print(f"Published {args.publish} as model version {version}")
+
+if __name__ == "__main__":
+    main()
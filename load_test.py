@@ -0,0 +1,399 @@
+import os
+import io
+import json
+import time
+import uuid
+import wave
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+import urllib.request
+import urllib.error
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import yaml
+
+
+def parse_mix(spec, cast=str):
+
+    mix = []
+    for item in spec.split(','):
+        value, _, weight = item.partition(':')
+        mix.append((cast(value), float(weight or 1)))
+    return mix
+
+def parse_levels(spec):
+
+    return [int(level) for level in spec.split(',')]
+
+def synthesize_clip(duration, sample_rate, seed=0):
+
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    pitch = 180 + 40 * np.sin(2 * np.pi * 0.5 * t)
+    y = 0.4 * np.sin(2 * np.pi * np.cumsum(pitch) / sample_rate) + 0.05 * rng.standard_normal(len(t))
+    return (np.clip(y, -1, 1) * 32767).astype('<i2')
+
+def encode_wav(pcm, sample_rate):
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+def encode_multipart(fields, files):
+
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    for name, value in fields.items():
+        body.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content_type, data) in files.items():
+        body.write((f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                    f'Content-Type: {content_type}\r\n\r\n').encode())
+        body.write(data)
+        body.write(b'\r\n')
+    body.write(f'--{boundary}--\r\n'.encode())
+    return body.getvalue(), f'multipart/form-data; boundary={boundary}'
+
+def build_payloads(clip_mix, format_mix, sample_rate):
+
+
+    payloads = {}
+    for duration, _ in clip_mix:
+        pcm = synthesize_clip(duration, sample_rate)
+        for upload_format, _ in format_mix:
+            if upload_format == 'pcm16':
+                payloads[(duration, upload_format)] = encode_multipart(
+                    {'format': 'pcm16', 'sample_rate': sample_rate},
+                    {'audio': ('recording.pcm', 'application/octet-stream', pcm.tobytes())}
+                )
+            elif upload_format == 'wav':
+                payloads[(duration, upload_format)] = encode_multipart(
+                    {}, {'audio': ('recording.wav', 'audio/wav', encode_wav(pcm, sample_rate))}
+                )
+            else:
+                raise ValueError(f"Unsupported upload format: {upload_format}")
+    return payloads
+
+def weighted_choice(mix, rng):
+
+    values, weights = zip(*mix)
+    return rng.choices(values, weights=weights)[0]
+
+def summarize(latencies, errors, elapsed, concurrency, **extra):
+
+    latencies = np.asarray(latencies, dtype=float)
+    summary = {
+        'concurrency': concurrency,
+        'requests': int(len(latencies) + errors),
+        'errors': int(errors),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed if elapsed > 0 else 0.0
+    }
+    summary.update(extra)
+
+    if len(latencies):
+        summary.update({
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p90_ms': float(np.percentile(latencies, 90)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'max_ms': float(latencies.max()),
+            'mean_ms': float(latencies.mean())
+        })
+
+
+        edges = np.geomspace(max(latencies.min(), 0.1), latencies.max() * 1.0001, 16)
+        counts, edges = np.histogram(latencies, bins=edges)
+        summary['histogram'] = {'edges_ms': edges.tolist(), 'counts': counts.tolist()}
+
+    return summary
+
+def run_http_level(url, payloads, clip_mix, format_mix, concurrency, duration, rate, timeout):
+
+
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def send(scheduled_at, rng):
+        nonlocal errors
+        key = (weighted_choice(clip_mix, rng), weighted_choice(format_mix, rng))
+        body, content_type = payloads[key]
+        request = urllib.request.Request(
+            f"{url}/analyze", data=body, headers={'Content-Type': content_type}, method='POST'
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+            ok = True
+        except (urllib.error.URLError, http.client.HTTPException, OSError):
+            ok = False
+
+
+        latency = (time.perf_counter() - scheduled_at) * 1000
+        with lock:
+            if ok:
+                latencies.append(latency)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    if rate:
+
+        rng = random.Random(0)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            next_at = start
+            while next_at < stop_at:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(send, next_at, random.Random(rng.random()))
+                next_at += rng.expovariate(rate)
+    else:
+
+        def worker(seed):
+            rng = random.Random(seed)
+            while time.perf_counter() < stop_at:
+                send(time.perf_counter(), rng)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return summarize(latencies, errors, time.perf_counter() - start, concurrency, offered_rps=rate)
+
+def run_socket_level(url, sessions, duration, event_interval, timeout):
+
+    import socketio
+
+
+    connect_times = []
+    latencies = []
+    errors = 0
+    failed_sessions = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def session(seed):
+        nonlocal errors, failed_sessions
+        client = socketio.Client(reconnection=False)
+        status = threading.Event()
+        client.on('recording_status', lambda data: status.set())
+
+        try:
+            start = time.perf_counter()
+            client.connect(url, wait_timeout=timeout)
+            with lock:
+                connect_times.append((time.perf_counter() - start) * 1000)
+        except Exception:
+            with lock:
+                failed_sessions += 1
+            return
+
+        try:
+            time.sleep(random.Random(seed).uniform(0, event_interval))
+            while time.perf_counter() < stop_at:
+                for event in ('start_recording', 'stop_recording'):
+                    status.clear()
+                    sent_at = time.perf_counter()
+                    client.emit(event)
+                    if not status.wait(timeout):
+                        raise TimeoutError(f"No reply to {event}")
+                    with lock:
+                        latencies.append((time.perf_counter() - sent_at) * 1000)
+                time.sleep(event_interval)
+        except Exception:
+            # The failed event is an error; the session stops sending after it
+            with lock:
+                errors += 1
+                failed_sessions += 1
+        finally:
+            client.disconnect()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return summarize(
+        latencies, errors, time.perf_counter() - start, sessions,
+        connected=len(connect_times),
+        failed_sessions=failed_sessions,
+        connect_p50_ms=float(np.percentile(connect_times, 50)) if connect_times else None,
+        connect_p99_ms=float(np.percentile(connect_times, 99)) if connect_times else None
+    )
+
+def print_level(name, level):
+
+    print(f"\n[{name}] concurrency {level['concurrency']}: {level['requests']} requests, "
+          f"{level['errors']} errors, {level['throughput_rps']:.1f} req/s")
+    if 'p50_ms' not in level:
+        return
+
+    print(f"  p50 {level['p50_ms']:.1f} ms  p90 {level['p90_ms']:.1f} ms  "
+          f"p99 {level['p99_ms']:.1f} ms  max {level['max_ms']:.1f} ms")
+
+    counts = level['histogram']['counts']
+    edges = level['histogram']['edges_ms']
+    scale = 40 / max(max(counts), 1)
+    for low, high, count in zip(edges, edges[1:], counts):
+        print(f"  {low:8.1f}-{high:8.1f} ms | {'#' * int(round(count * scale)):<40} {count}")
+
+def git_commit():
+
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def plot_results(results, output_path):
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, (ax_throughput, ax_latency) = plt.subplots(1, 2, figsize=(12, 4.5))
+    for name, levels in results['levels'].items():
+        concurrency = [l['concurrency'] for l in levels]
+        ax_throughput.plot(concurrency, [l['throughput_rps'] for l in levels], marker='o', label=name)
+        ax_latency.plot(concurrency, [l.get('p50_ms', np.nan) for l in levels], marker='o', label=f"{name} p50")
+        ax_latency.plot(concurrency, [l.get('p99_ms', np.nan) for l in levels], marker='x', linestyle='--',
+                        label=f"{name} p99")
+
+    ax_throughput.set(xlabel='Concurrency', ylabel='Throughput (req/s)', title='Throughput vs concurrency')
+    ax_latency.set(xlabel='Concurrency', ylabel='Latency (ms)', title='Latency vs concurrency', yscale='log')
+    for ax in (ax_throughput, ax_latency):
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+    fig.suptitle(f"{results['commit']} {results['timestamp']}")
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
+
+def compare_results(baseline_path, candidate_path):
+
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    with open(candidate_path, 'r') as f:
+        candidate = json.load(f)
+
+    print(f"Baseline {baseline['commit']} ({baseline['timestamp']}) vs "
+          f"candidate {candidate['commit']} ({candidate['timestamp']})")
+
+    for name, levels in candidate['levels'].items():
+        base_levels = {l['concurrency']: l for l in baseline['levels'].get(name, [])}
+        print(f"\n[{name}]")
+        print(f"  {'conc':>6}{'req/s':>18}{'p50 ms':>22}{'p99 ms':>22}")
+        for level in levels:
+            base = base_levels.get(level['concurrency'])
+            if base is None:
+                continue
+
+            cells = []
+            for key in ('throughput_rps', 'p50_ms', 'p99_ms'):
+                old, new = base.get(key), level.get(key)
+                if old is None or new is None:
+                    cells.append(f"{'n/a':>22}")
+                    continue
+                change = (new - old) / old * 100 if old else 0.0
+                cells.append(f"{old:>8.1f} -> {new:<8.1f}{change:+5.0f}%")
+            print(f"  {level['concurrency']:>6}" + ''.join(cells))
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Load test the emotion recognition server')
+    parser.add_argument('--url', type=str, default='http://localhost:5000', help='Server base URL')
+    parser.add_argument('--config', type=str, default='config/config.yaml',
+                       help='Path to the config file')
+    parser.add_argument('--mode', choices=['http', 'socket', 'both'], default='both',
+                       help='Serving paths to exercise')
+    parser.add_argument('--concurrency', type=str, default='1,2,4,8,16',
+                       help='Comma-separated /analyze concurrency levels to sweep')
+    parser.add_argument('--rate', type=float, default=0,
+                       help='Open-loop arrival rate in req/s (0 = closed loop at each concurrency)')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds per level')
+    parser.add_argument('--clip-mix', type=str, default='1:0.3,3:0.5,6:0.2',
+                       help='Clip lengths in seconds with weights, e.g. "1:0.3,3:0.7"')
+    parser.add_argument('--formats', type=str, default='pcm16:0.5,wav:0.5',
+                       help='Upload formats (pcm16, wav) with weights')
+    parser.add_argument('--sessions', type=str, default='10,50,100',
+                       help='Comma-separated concurrent Socket.IO session counts to sweep')
+    parser.add_argument('--event-interval', type=float, default=1.0,
+                       help='Seconds between start/stop event pairs in each session')
+    parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds')
+    parser.add_argument('--output-dir', type=str, default='loadtest_results',
+                       help='Directory for result files')
+    parser.add_argument('--no-plot', action='store_true', help='Skip writing the curve plot')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'),
+                       help='Compare two saved result files instead of running')
+
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+        return
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    clip_mix = parse_mix(args.clip_mix, float)
+    format_mix = parse_mix(args.formats)
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'url': args.url,
+        'settings': vars(args),
+        'levels': {}
+    }
+
+
+    if args.mode in ('http', 'both'):
+        payloads = build_payloads(clip_mix, format_mix, config['sample_rate'])
+        results['levels']['http'] = []
+        for concurrency in parse_levels(args.concurrency):
+            level = run_http_level(args.url, payloads, clip_mix, format_mix,
+                                   concurrency, args.duration, args.rate, args.timeout)
+            results['levels']['http'].append(level)
+            print_level('http', level)
+
+    if args.mode in ('socket', 'both'):
+        results['levels']['socket'] = []
+        for sessions in parse_levels(args.sessions):
+            level = run_socket_level(args.url, sessions, args.duration, args.event_interval, args.timeout)
+            results['levels']['socket'].append(level)
+            print_level('socket', level)
+            print(f"  connected {level['connected']}/{sessions} sessions, "
+                  f"{level['failed_sessions']} failed")
+
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stem = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{results['commit']}"
+    output_path = os.path.join(args.output_dir, f"{stem}.json")
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output_path}")
+
+    if not args.no_plot:
+        plot_path = os.path.join(args.output_dir, f"{stem}.png")
+        plot_results(results, plot_path)
+        print(f"Curves saved to {plot_path}")
+
+if __name__ == "__main__":
+    main()
@@ -10,15 +10,17 @@ import tensorflow as tf
 import soundfile as sf
 
 
-from models.crnn import CRNN
 from utils.audio_processor import AudioProcessor
+from utils.model_registry import ModelRegistry, HotSwapModel
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class EmotionPredictor:
-    def __init__(self, config_path='config/config.yaml', model_path=None):
+    DEFAULT_CLASS_NAMES = ['angry', 'happy', 'neutral', 'sad']
+    
+    def __init__(self, config_path='config/config.yaml', model_path=None, watch=False, class_names=None):
         
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
@@ -27,19 +29,50 @@ class EmotionPredictor:
         self.audio_processor = AudioProcessor(config_path)
         
         
-        self.model = CRNN(config_path)
-        if model_path is None:
-            model_path = os.path.join(self.config['model_dir'], 'best_model.h5')
+        self.registry = ModelRegistry(self.config['model_dir'])
+        self.model_server = HotSwapModel(self.registry, self._load_model)
         
-        if os.path.exists(model_path):
-            self.model.load(model_path)
-            logger.info(f"Model loaded from {model_path}")
+        if model_path is None and self.registry.current_version() is not None:
+            if watch:
+                self.model_server.start()
+            else:
+                self.model_server.refresh()
+            
+            if not self.model_server.is_ready():
+                raise RuntimeError(f"Failed to load model version {self.registry.current_version()}")
         else:
-            logger.error(f"Model not found at {model_path}")
-            raise FileNotFoundError(f"Model not found at {model_path}")
+            if model_path is None:
+                model_path = os.path.join(self.config['model_dir'], 'best_model.h5')
+            
+            if not os.path.exists(model_path):
+                logger.error(f"Model not found at {model_path}")
+                raise FileNotFoundError(f"Model not found at {model_path}")
+            
+            self.model_server.swap(
+                os.path.basename(model_path),
+                self._load_model(model_path),
+                class_names or self._file_class_names(model_path)
+            )
+        
+        logger.info(f"Model version {self.model_server.version} loaded")
+    
+    def _file_class_names(self, model_path):
+        
+        
+        metadata_path = os.path.join(os.path.dirname(model_path), ModelRegistry.METADATA_FILENAME)
+        if os.path.exists(metadata_path):
+            with open(metadata_path, 'r') as f:
+                class_names = json.load(f).get('class_names')
+            if class_names:
+                return class_names
+        
+        logger.warning(f"No class names recorded for {model_path}; assuming {self.DEFAULT_CLASS_NAMES}")
+        return self.DEFAULT_CLASS_NAMES
+    
+    def _load_model(self, model_path):
         
         
-        self.class_names = ['happy', 'sad', 'angry', 'neutral']
+        return tf.keras.models.load_model(model_path, compile=False)
     
     def predict_emotion(self, audio_path):
         
@@ -58,11 +91,11 @@ class EmotionPredictor:
             spectrogram = np.expand_dims(spectrogram, axis=0)
             
             
-            predictions = self.model.model.predict(spectrogram, verbose=0)
+            model_version, class_names, predictions = self.model_server.predict(spectrogram)
             
             
             predicted_class_idx = np.argmax(predictions[0])
-            predicted_emotion = self.class_names[predicted_class_idx]
+            predicted_emotion = class_names[predicted_class_idx]
             predicted_confidence = float(predictions[0][predicted_class_idx])
             
             
@@ -71,7 +104,7 @@ class EmotionPredictor:
                     'emotion': emotion,
                     'confidence': float(confidence)
                 }
-                for emotion, confidence in zip(self.class_names, predictions[0])
+                for emotion, confidence in zip(class_names, predictions[0])
             ]
             
             
@@ -81,7 +114,8 @@ class EmotionPredictor:
                 'success': True,
                 'predicted_emotion': predicted_emotion,
                 'confidence': predicted_confidence,
-                'all_predictions': all_predictions
+                'all_predictions': all_predictions,
+                'model_version': model_version
             }
             
         except Exception as e:
@@ -99,6 +133,8 @@ def main():
     parser.add_argument('--model', type=str, help='Path to the trained model')
     parser.add_argument('--config', type=str, default='config/config.yaml', 
                        help='Path to the config file')
+    parser.add_argument('--class-names', type=str,
+                       help='Comma-separated class names in model output order (for --model files)')
     
     args = parser.parse_args()
     
@@ -106,7 +142,8 @@ def main():
     try:
         predictor = EmotionPredictor(
             config_path=args.config,
-            model_path=args.model
+            model_path=args.model,
+            class_names=args.class_names.split(',') if args.class_names else None
         )
     except Exception as e:
         logger.error(f"Failed to initialize predictor: {str(e)}")
@@ -119,7 +156,8 @@ def main():
     if result['success']:
         print("\nEmotion Prediction Results:")
         print(f"Predicted Emotion: {result['predicted_emotion']}")
-        print(f"Confidence: {result['confidence']:.2%}\n")
+        print(f"Confidence: {result['confidence']:.2%}")
+        print(f"Model Version: {result['model_version']}\n")
         
         print("All Predictions:")
         for pred in result['all_predictions']:
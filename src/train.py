@@ -9,6 +9,7 @@ import logging
 from models.crnn import CRNN
 from data.data_loader import AudioDataLoader
 from utils.audio_processor import AudioProcessor
+from utils.model_registry import ModelRegistry
 
 
 logging.basicConfig(level=logging.INFO)
@@ -22,19 +23,22 @@ class EmotionRecognitionTrainer:
         
         
         self.model_dir = self.config['model_dir']
-        self.log_dir = os.path.join(self.config['log_dir'], datetime.now().strftime("%Y%m%d-%H%M%S"))
-        os.makedirs(self.model_dir, exist_ok=True)
+        run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.run_dir = os.path.join(self.model_dir, 'runs', run_id)
+        self.log_dir = os.path.join(self.config['log_dir'], run_id)
+        os.makedirs(self.run_dir, exist_ok=True)
         os.makedirs(self.log_dir, exist_ok=True)
         
         
         self.audio_processor = AudioProcessor(config_path)
         self.data_loader = AudioDataLoader(config_path)
         self.model = CRNN(config_path)
+        self.registry = ModelRegistry(self.model_dir)
         
         
         self.model.summary()
     
-    def train(self):
+    def train(self, activate=True):
         
         
         (X_train, y_train), (X_val, y_val), _ = self.data_loader.load_dataset(
@@ -50,6 +54,7 @@ class EmotionRecognitionTrainer:
         validation_steps = len(X_val) // self.config['batch_size']
         
         
+        best_model_path = os.path.join(self.run_dir, 'best_model.h5')
         callbacks = [
             
             tf.keras.callbacks.EarlyStopping(
@@ -60,7 +65,7 @@ class EmotionRecognitionTrainer:
             ),
             
             tf.keras.callbacks.ModelCheckpoint(
-                filepath=os.path.join(self.model_dir, 'best_model.h5'),
+                filepath=best_model_path,
                 monitor='val_accuracy',
                 save_best_only=True,
                 mode='max',
@@ -100,10 +105,27 @@ class EmotionRecognitionTrainer:
         )
         
         
-        final_model_path = os.path.join(self.model_dir, 'final_model.h5')
+        final_model_path = os.path.join(self.run_dir, 'final_model.h5')
         self.model.save(final_model_path)
         logger.info(f"Training completed. Model saved to {final_model_path}")
         
+        
+        self.model.load(best_model_path)
+        val_loss, val_accuracy = self.model.model.evaluate(val_dataset, verbose=0)
+        logger.info(f"Best checkpoint validation accuracy: {val_accuracy:.4f}")
+        
+        
+        version = self.registry.publish(
+            best_model_path,
+            metadata={
+                'val_accuracy': float(val_accuracy),
+                'val_loss': float(val_loss),
+                'class_names': [str(c) for c in self.data_loader.label_encoder.classes_]
+            },
+            activate=activate
+        )
+        logger.info(f"Published model version {version}")
+        
         return history
 
 if __name__ == "__main__":
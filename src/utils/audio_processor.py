@@ -6,6 +6,8 @@ import yaml
 from pathlib import Path
 import logging
 
+from .feature_extractor import FeatureExtractor
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,6 +20,9 @@ class AudioProcessor:
         
         
         os.makedirs(self.config['processed_dir'], exist_ok=True)
+        
+        
+        self.feature_extractor = FeatureExtractor(config_path)
     
     def load_audio(self, file_path):
         
@@ -29,6 +34,12 @@ class AudioProcessor:
             logger.error(f"Error loading audio file {file_path}: {str(e)}")
             return None, None
     
+    def load_pcm16(self, data):
+        
+        
+        y = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+        return y, self.config['sample_rate']
+    
     def preprocess_audio(self, y, sr):
         
         
@@ -49,29 +60,20 @@ class AudioProcessor:
         
         return y_processed
     
-    def extract_mel_spectrogram(self, y, sr):
-        
-        
-        S = librosa.feature.melspectrogram(
-            y=y,
-            sr=sr,
-            n_fft=self.config['n_fft'],
-            hop_length=self.config['hop_length'],
-            n_mels=self.config['n_mels'],
-            fmin=self.config['fmin'],
-            fmax=self.config['fmax']
-        )
+    def extract_features(self, y, sr):
         
         
-        S_dB = librosa.power_to_db(S, ref=np.max)
+        return self.feature_extractor.extract(y, sr)
+    
+    def process_pcm16(self, data):
         
         
-        S_norm = (S_dB - S_dB.min()) / (S_dB.max() - S_dB.min())
+        y, sr = self.load_pcm16(data)
         
         
-        S_norm = np.expand_dims(S_norm, axis=-1)
+        y_processed = self.preprocess_audio(y, sr)
         
-        return S_norm
+        return self.extract_features(y_processed, sr)
     
     def process_file(self, file_path, save=False):
         
@@ -84,7 +86,7 @@ class AudioProcessor:
         y_processed = self.preprocess_audio(y, sr)
         
         
-        spectrogram = self.extract_mel_spectrogram(y_processed, sr)
+        spectrogram = self.extract_features(y_processed, sr)
         
         
         if save:
@@ -0,0 +1,116 @@
+import numpy as np
+import librosa
+import yaml
+import logging
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class FeatureExtractor:
+    FEATURES = ('mel', 'mel_delta', 'mel_delta2', 'mfcc', 'mfcc_delta', 'mfcc_delta2', 'spectral')
+    CONTRAST_SCALE_DB = 80.0
+
+    def __init__(self, config_path='../config/config.yaml'):
+
+        with open(config_path, 'r') as f:
+            self.config = yaml.safe_load(f)
+
+        self.features = list(self.config.get('features', ['mel']))
+        unknown = [name for name in self.features if name not in self.FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown features {unknown}; expected any of {list(self.FEATURES)}")
+
+        channels = self._input_channels()
+        if channels != len(self.features):
+            raise ValueError(
+                f"input_shape has {channels} channels but {len(self.features)} features are configured: "
+                f"{self.features}"
+            )
+
+
+        self._mel_basis = {}
+
+    def _input_channels(self):
+
+
+        input_shape = self.config['input_shape']
+        if isinstance(input_shape, str):
+            input_shape = [int(dim) for dim in input_shape.strip('()[] ').split(',') if dim.strip()]
+        return int(input_shape[-1])
+
+    def _mel_filterbank(self, sr):
+
+        if sr not in self._mel_basis:
+            self._mel_basis[sr] = librosa.filters.mel(
+                sr=sr,
+                n_fft=self.config['n_fft'],
+                n_mels=self.config['n_mels'],
+                fmin=self.config['fmin'],
+                fmax=self.config['fmax']
+            )
+        return self._mel_basis[sr]
+
+    def extract(self, y, sr):
+
+
+        magnitude = np.abs(librosa.stft(
+            y, n_fft=self.config['n_fft'], hop_length=self.config['hop_length']
+        ))
+        power = magnitude ** 2
+
+
+        log_mel = librosa.power_to_db(self._mel_filterbank(sr) @ power, ref=np.max)
+
+        computed = {'mel': log_mel}
+        if any(name.startswith('mel_') for name in self.features):
+            computed['mel_delta'] = librosa.feature.delta(log_mel, order=1)
+            computed['mel_delta2'] = librosa.feature.delta(log_mel, order=2)
+
+        if any(name.startswith('mfcc') for name in self.features):
+            mfcc = librosa.feature.mfcc(S=log_mel, n_mfcc=self.config['n_mfcc'])
+            computed['mfcc'] = mfcc
+            computed['mfcc_delta'] = librosa.feature.delta(mfcc, order=1)
+            computed['mfcc_delta2'] = librosa.feature.delta(mfcc, order=2)
+
+        if 'spectral' in self.features:
+            computed['spectral'] = self._spectral_statistics(magnitude, sr)
+
+
+        channels = [self._to_channel(computed[name], normalize=(name != 'spectral'))
+                    for name in self.features]
+        return np.stack(channels, axis=-1)
+
+    def _spectral_statistics(self, magnitude, sr):
+
+        n_fft = self.config['n_fft']
+        hop_length = self.config['hop_length']
+
+
+        n_bands = min(6, int(np.log2(sr / 2 / 200)))
+        nyquist = sr / 2
+
+
+        statistics = np.vstack([
+            librosa.feature.spectral_centroid(S=magnitude, sr=sr, n_fft=n_fft, hop_length=hop_length) / nyquist,
+            librosa.feature.spectral_bandwidth(S=magnitude, sr=sr, n_fft=n_fft, hop_length=hop_length) / nyquist,
+            librosa.feature.spectral_rolloff(S=magnitude, sr=sr, n_fft=n_fft, hop_length=hop_length) / nyquist,
+            librosa.feature.spectral_flatness(S=magnitude),
+            librosa.feature.spectral_contrast(S=magnitude, sr=sr, n_fft=n_fft, hop_length=hop_length,
+                                              n_bands=n_bands) / self.CONTRAST_SCALE_DB
+        ])
+        return np.clip(statistics, 0, 1)
+
+    def _to_channel(self, feature, normalize=True):
+
+        if normalize:
+            low = feature.min()
+            span = feature.max() - low
+            feature = (feature - low) / span if span > 0 else np.zeros_like(feature)
+
+
+        n_mels = self.config['n_mels']
+        if feature.shape[0] < n_mels:
+            feature = np.pad(feature, ((0, n_mels - feature.shape[0]), (0, 0)), mode='constant')
+
+        return feature[:n_mels]
@@ -0,0 +1,263 @@
+import os
+import json
+import shutil
+import argparse
+import threading
+from datetime import datetime
+import logging
+
+import numpy as np
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    MODEL_FILENAME = 'model.h5'
+    METADATA_FILENAME = 'metadata.json'
+    STATE_FILENAME = 'registry.json'
+
+    def __init__(self, model_dir):
+
+        self.model_dir = model_dir
+        self.versions_dir = os.path.join(model_dir, 'versions')
+        self.state_path = os.path.join(model_dir, self.STATE_FILENAME)
+        self._lock = threading.Lock()
+
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    def list_versions(self):
+
+        return sorted(
+            v for v in os.listdir(self.versions_dir)
+            if not v.startswith('.') and os.path.exists(self.model_path(v))
+        )
+
+    def model_path(self, version):
+
+        return os.path.join(self.versions_dir, version, self.MODEL_FILENAME)
+
+    def metadata(self, version):
+
+        path = os.path.join(self.versions_dir, version, self.METADATA_FILENAME)
+        if not os.path.exists(path):
+            return {}
+
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def current_version(self):
+
+        return self._read_state()['current']
+
+    def publish(self, model_path, metadata=None, activate=True):
+
+        with self._lock:
+            version = datetime.now().strftime('v%Y%m%d-%H%M%S')
+            suffix = 1
+            while os.path.exists(os.path.join(self.versions_dir, version)):
+                version = f"{datetime.now().strftime('v%Y%m%d-%H%M%S')}-{suffix}"
+                suffix += 1
+
+
+            staging_dir = os.path.join(self.versions_dir, f".{version}.tmp")
+            os.makedirs(staging_dir)
+            shutil.copy2(model_path, os.path.join(staging_dir, self.MODEL_FILENAME))
+
+            metadata = dict(metadata or {})
+            metadata.update({
+                'version': version,
+                'source': os.path.abspath(model_path),
+                'published_at': datetime.now().isoformat()
+            })
+            with open(os.path.join(staging_dir, self.METADATA_FILENAME), 'w') as f:
+                json.dump(metadata, f, indent=2)
+
+            os.rename(staging_dir, os.path.join(self.versions_dir, version))
+
+        logger.info(f"Published model version {version} from {model_path}")
+
+        if activate:
+            self.activate(version)
+
+        return version
+
+    def activate(self, version):
+
+        if version.startswith('.') or not os.path.exists(self.model_path(version)):
+            raise ValueError(f"Unknown model version: {version}")
+
+        with self._lock:
+            state = self._read_state()
+            if version == state['current']:
+                return
+
+            state['current'] = version
+            state['history'].append(version)
+            self._write_state(state)
+
+        logger.info(f"Activated model version {version}")
+
+    def rollback(self):
+
+        with self._lock:
+            state = self._read_state()
+            if len(state['history']) < 2:
+                raise ValueError("No previous model version to roll back to")
+
+            state['history'].pop()
+            state['current'] = state['history'][-1]
+            self._write_state(state)
+
+        logger.info(f"Rolled back to model version {state['current']}")
+        return state['current']
+
+    def _read_state(self):
+
+        if not os.path.exists(self.state_path):
+            return {'current': None, 'history': []}
+
+        with open(self.state_path, 'r') as f:
+            return json.load(f)
+
+    def _write_state(self, state):
+
+
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+class HotSwapModel:
+    def __init__(self, registry, load_fn, poll_interval=5.0):
+
+        self.registry = registry
+        self.load_fn = load_fn
+        self.poll_interval = poll_interval
+
+
+        self._active = (None, None, None)
+        self._failed_version = None
+        self._load_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def version(self):
+        return self._active[0]
+
+    @property
+    def class_names(self):
+        return self._active[2]
+
+    def is_ready(self):
+        return self._active[1] is not None
+
+    def swap(self, version, model, class_names):
+
+
+        shape = [1 if dim is None else dim for dim in model.input_shape]
+        model.predict(np.zeros(shape, dtype=np.float32), verbose=0)
+
+
+        previous_version = self.version
+        self._active = (version, model, list(class_names))
+        logger.info(f"Serving model version {version} (previous: {previous_version})")
+
+    def refresh(self):
+
+        version = self.registry.current_version()
+        if version is None or version in (self.version, self._failed_version):
+            return False
+
+        with self._load_lock:
+            if version == self.version:
+                return False
+
+            try:
+                class_names = self.registry.metadata(version).get('class_names')
+                if not class_names:
+                    raise ValueError("version metadata has no class_names")
+
+                model = self.load_fn(self.registry.model_path(version))
+                self.swap(version, model, class_names)
+            except Exception as e:
+                self._failed_version = version
+                logger.error(f"Failed to load model version {version}, keeping {self.version}: {str(e)}")
+                return False
+
+        self._failed_version = None
+        return True
+
+    def start(self):
+
+        self.refresh()
+
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._watch, name='model-loader', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def predict(self, batch):
+
+
+        version, model, class_names = self._active
+        if model is None:
+            raise RuntimeError("No model version is loaded")
+
+        return version, class_names, model.predict(batch, verbose=0)
+
+    def _watch(self):
+
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error checking model registry: {str(e)}")
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Manage versioned emotion models')
+    parser.add_argument('--model-dir', type=str, default='models',
+                       help='Directory holding the model registry')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='List published model versions')
+    publish_parser = subparsers.add_parser('publish', help='Publish a model file as a new version')
+    publish_parser.add_argument('model_path', type=str, help='Path to the model file')
+    publish_parser.add_argument('--class-names', type=str, required=True,
+                               help='Comma-separated class names in model output order')
+    publish_parser.add_argument('--no-activate', action='store_true',
+                               help='Publish without switching serving to the new version')
+    activate_parser = subparsers.add_parser('activate', help='Serve a published version')
+    activate_parser.add_argument('version', type=str, help='Version to activate')
+    subparsers.add_parser('rollback', help='Return to the previously active version')
+
+    args = parser.parse_args()
+    registry = ModelRegistry(args.model_dir)
+
+    if args.command == 'list':
+        current = registry.current_version()
+        for version in registry.list_versions():
+            marker = '*' if version == current else ' '
+            print(f"{marker} {version}")
+    elif args.command == 'publish':
+        print(registry.publish(
+            args.model_path,
+            metadata={'class_names': args.class_names.split(',')},
+            activate=not args.no_activate
+        ))
+    elif args.command == 'activate':
+        registry.activate(args.version)
+    elif args.command == 'rollback':
+        print(registry.rollback())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+// Downmixes microphone input to mono and converts it to 16-bit PCM before
+// handing it back to the main thread. Resampling is left to the browser: the
+// recorder runs this worklet in an AudioContext created at the model's sample rate.
+class PcmDownmixer extends AudioWorkletProcessor {
+    constructor(options) {
+        super();
+
+        // Samples past the maximum upload length are dropped; the server ignores them anyway
+        this.maxSamples = options.processorOptions.maxSamples;
+        this.totalSamples = 0;
+
+        // Output is posted in fixed-size chunks to keep message traffic low
+        this.chunkSize = 4096;
+        this.chunk = new Int16Array(this.chunkSize);
+        this.chunkLength = 0;
+
+        this.port.onmessage = (event) => {
+            if (event.data === 'flush') {
+                this.post('flush');
+            }
+        };
+    }
+
+    process(inputs) {
+        const input = inputs[0];
+        if (!input || input.length === 0 || this.totalSamples >= this.maxSamples) return true;
+
+        const channels = input.length;
+        const frames = input[0].length;
+
+        for (let i = 0; i < frames; i++) {
+            // Downmix to mono
+            let sample = 0;
+            for (let c = 0; c < channels; c++) {
+                sample += input[c][i];
+            }
+
+            this.push(sample / channels);
+
+            if (this.totalSamples >= this.maxSamples) {
+                this.post('flush');
+                break;
+            }
+        }
+
+        return true;
+    }
+
+    push(value) {
+        const clamped = Math.max(-1, Math.min(1, value));
+        this.chunk[this.chunkLength++] = clamped < 0 ? clamped * 0x8000 : clamped * 0x7FFF;
+        this.totalSamples++;
+
+        if (this.chunkLength === this.chunkSize) {
+            this.post('data');
+        }
+    }
+
+    post(type) {
+        const samples = this.chunk.slice(0, this.chunkLength);
+        this.port.postMessage({ type, samples }, [samples.buffer]);
+        this.chunkLength = 0;
+    }
+}
+
+registerProcessor('pcm-downmixer', PcmDownmixer);
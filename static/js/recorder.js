@@ -7,6 +7,16 @@ class AudioRecorder {
         this.analyser = null;
         this.stream = null;
         this.recordedAudio = null;
+        this.recordedFormat = null;
+        
+        // PCM capture ("pcm16" uploads are resampled in the browser)
+        this.uploadFormat = document.body.dataset.uploadFormat || 'media';
+        this.targetSampleRate = parseInt(document.body.dataset.sampleRate, 10) || 22050;
+        this.maxDuration = parseFloat(document.body.dataset.maxDuration) || 5;
+        this.pcmCapture = false;
+        this.workletNode = null;
+        this.sinkNode = null;
+        this.pcmChunks = [];
         
         // DOM Elements
         this.recordButton = document.getElementById('recordButton');
@@ -31,45 +41,25 @@ class AudioRecorder {
             // Request microphone access
             this.stream = await navigator.mediaDevices.getUserMedia({ audio: true });
             
-            // Set up audio context and analyzer
-            this.audioContext = new (window.AudioContext || window.webkitAudioContext)();
+            // Set up audio context, media stream source and analyzer
+            const source = this.createAudioSource();
             this.analyser = this.audioContext.createAnalyser();
             this.analyser.fftSize = 2048;
-            
-            // Create media stream source
-            const source = this.audioContext.createMediaStreamSource(this.stream);
             source.connect(this.analyser);
             
-            // Initialize MediaRecorder
-            this.mediaRecorder = new MediaRecorder(this.stream);
-            this.audioChunks = [];
-            
-            // Handle data available event
-            this.mediaRecorder.ondataavailable = (event) => {
-                if (event.data.size > 0) {
-                    this.audioChunks.push(event.data);
+            if (this.pcmCapture) {
+                try {
+                    await this.startPcmCapture(source);
+                } catch (error) {
+                    // Worklet unavailable (CSP, failed fetch, older browsers)
+                    console.warn('PCM capture failed, falling back to MediaRecorder:', error);
+                    this.stopPcmCapture();
+                    this.pcmCapture = false;
+                    this.startMediaRecorder();
                 }
-            };
-            
-            // Handle recording stop
-            this.mediaRecorder.onstop = () => {
-                const audioBlob = new Blob(this.audioChunks, { type: 'audio/wav' });
-                this.recordedAudio = URL.createObjectURL(audioBlob);
-                
-                // Enable analyze button
-                this.analyzeButton.disabled = false;
-                
-                // Update UI
-                this.statusText.textContent = 'Recording complete';
-                this.statusDot.style.backgroundColor = '#28a745'; // Green
-                
-                // Emit event
-                const event = new CustomEvent('recordingComplete', { detail: { audioUrl: this.recordedAudio } });
-                document.dispatchEvent(event);
-            };
-            
-            // Start recording
-            this.mediaRecorder.start(100); // Collect data every 100ms
+            } else {
+                this.startMediaRecorder();
+            }
             this.isRecording = true;
             
             // Update UI
@@ -90,16 +80,139 @@ class AudioRecorder {
         }
     }
     
+    createAudioSource() {
+        const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+        
+        // PCM capture runs the context at the model's sample rate, so the
+        // browser's resampler (not the worklet) converts the microphone input
+        if (this.uploadFormat === 'pcm16') {
+            this.audioContext = null;
+            try {
+                this.audioContext = new AudioContextClass({ sampleRate: this.targetSampleRate });
+                if (this.audioContext.audioWorklet && this.audioContext.sampleRate === this.targetSampleRate) {
+                    const source = this.audioContext.createMediaStreamSource(this.stream);
+                    this.pcmCapture = true;
+                    return source;
+                }
+            } catch (error) {
+                console.warn('PCM capture unavailable, falling back to MediaRecorder:', error);
+            }
+            
+            if (this.audioContext) {
+                this.audioContext.close();
+            }
+        }
+        
+        this.pcmCapture = false;
+        this.audioContext = new AudioContextClass();
+        return this.audioContext.createMediaStreamSource(this.stream);
+    }
+    
+    startMediaRecorder() {
+        // Initialize MediaRecorder
+        this.mediaRecorder = new MediaRecorder(this.stream);
+        this.audioChunks = [];
+        
+        // Handle data available event
+        this.mediaRecorder.ondataavailable = (event) => {
+            if (event.data.size > 0) {
+                this.audioChunks.push(event.data);
+            }
+        };
+        
+        // Handle recording stop
+        this.mediaRecorder.onstop = () => {
+            const audioBlob = new Blob(this.audioChunks, { type: 'audio/wav' });
+            this.finishRecording(audioBlob, 'media');
+        };
+        
+        // Start recording
+        this.mediaRecorder.start(100); // Collect data every 100ms
+    }
+    
+    async startPcmCapture(source) {
+        // Downmix and convert to 16-bit PCM off the main thread
+        await this.audioContext.audioWorklet.addModule('/static/js/pcm-worklet.js');
+        this.workletNode = new AudioWorkletNode(this.audioContext, 'pcm-downmixer', {
+            processorOptions: { maxSamples: Math.round(this.maxDuration * this.targetSampleRate) }
+        });
+        this.pcmChunks = [];
+        
+        // Handle PCM chunks posted by the worklet; it flushes by itself once the
+        // maximum upload length is reached, which ends the recording
+        this.workletNode.port.onmessage = (event) => {
+            this.pcmChunks.push(event.data.samples);
+            
+            if (event.data.type === 'flush') {
+                this.stopPcmCapture();
+                if (this.isRecording) {
+                    this.endRecording();
+                }
+                
+                const audioBlob = new Blob(this.pcmChunks, { type: 'application/octet-stream' });
+                this.pcmChunks = [];
+                this.finishRecording(audioBlob, 'pcm16');
+            }
+        };
+        
+        // Keep the worklet pulled by the graph without making it audible
+        this.sinkNode = this.audioContext.createGain();
+        this.sinkNode.gain.value = 0;
+        source.connect(this.workletNode);
+        this.workletNode.connect(this.sinkNode);
+        this.sinkNode.connect(this.audioContext.destination);
+    }
+    
+    stopPcmCapture() {
+        if (this.workletNode) {
+            this.workletNode.port.onmessage = null;
+            this.workletNode.disconnect();
+            this.workletNode = null;
+        }
+        if (this.sinkNode) {
+            this.sinkNode.disconnect();
+            this.sinkNode = null;
+        }
+    }
+    
+    finishRecording(audioBlob, format) {
+        this.recordedAudio = URL.createObjectURL(audioBlob);
+        this.recordedFormat = format;
+        
+        // Enable analyze button
+        this.analyzeButton.disabled = false;
+        
+        // Update UI
+        this.statusText.textContent = 'Recording complete';
+        this.statusDot.style.backgroundColor = '#28a745'; // Green
+        
+        // Emit event
+        const event = new CustomEvent('recordingComplete', { detail: { audioUrl: this.recordedAudio } });
+        document.dispatchEvent(event);
+    }
+    
     stopRecording() {
-        if (this.isRecording && this.mediaRecorder && this.mediaRecorder.state !== 'inactive') {
+        if (!this.isRecording) return;
+        
+        if (this.workletNode) {
+            // The worklet replies with its remaining samples, which completes the recording
+            this.workletNode.port.postMessage('flush');
+        } else if (this.mediaRecorder && this.mediaRecorder.state !== 'inactive') {
             this.mediaRecorder.stop();
-            this.stream.getTracks().forEach(track => track.stop());
-            this.isRecording = false;
-            
-            // Update UI
-            this.recordButton.disabled = false;
-            this.stopButton.disabled = true;
+        } else {
+            return;
         }
+        
+        this.endRecording();
+    }
+    
+    endRecording() {
+        this.stream.getTracks().forEach(track => track.stop());
+        this.isRecording = false;
+        
+        // Update UI
+        this.recordButton.disabled = false;
+        this.stopButton.disabled = true;
     }
     
     visualize() {
@@ -134,14 +247,19 @@ class AudioRecorder {
             this.analyzeButton.disabled = true;
             this.analyzeButton.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Analyzing...';
             
-            // Convert blob to file
+            // Fetch the recorded blob
             const response = await fetch(this.recordedAudio);
             const blob = await response.blob();
-            const file = new File([blob], 'recording.wav', { type: 'audio/wav' });
             
-            // Create form data
+            // Create form data (PCM uploads carry their format and sample rate)
             const formData = new FormData();
-            formData.append('audio', file);
+            if (this.recordedFormat === 'pcm16') {
+                formData.append('audio', new File([blob], 'recording.pcm', { type: 'application/octet-stream' }));
+                formData.append('format', 'pcm16');
+                formData.append('sample_rate', this.targetSampleRate);
+            } else {
+                formData.append('audio', new File([blob], 'recording.wav', { type: 'audio/wav' }));
+            }
             
             // Send to server for analysis
             const result = await fetch('/analyze', {
@@ -173,6 +291,9 @@ class AudioRecorder {
         this.isRecording = false;
         this.audioChunks = [];
         this.recordedAudio = null;
+        this.recordedFormat = null;
+        this.pcmChunks = [];
+        this.stopPcmCapture();
         
         // Stop all tracks in the stream
         if (this.stream) {
@@ -11,11 +11,13 @@ from tqdm import tqdm
 import pandas as pd
 from pathlib import Path
 import random
+from datetime import datetime
 
 
 from src.models.crnn import CRNN
 from src.data.data_loader import AudioDataLoader
 from src.utils.audio_processor import AudioProcessor
+from src.utils.model_registry import ModelRegistry
 
 class EmotionTrainer:
     def __init__(self, config_path='config/config.yaml'):
@@ -31,6 +33,7 @@ class EmotionTrainer:
         self.audio_processor = AudioProcessor(config_path)
         self.data_loader = AudioDataLoader(config_path)
         self.model = CRNN(config_path)
+        self.registry = ModelRegistry(self.config['model_dir'])
         
         
         self.model.summary()
@@ -86,32 +89,23 @@ class EmotionTrainer:
         
         return X, y_categorical
     
-    def train(self, X, y, test_size=0.2, val_size=0.1, random_state=42):
+    def train(self, X, y, test_size=0.2, val_size=0.1, random_state=42, activate=True):
         
         print("\nStarting model training...")
         
         
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state, stratify=y
-        )
+        run_dir = self._create_run_dir()
         
         
-        val_size_adjusted = val_size / (1 - test_size)
-        X_train, X_val, y_train, y_val = train_test_split(
-            X_train, y_train, 
-            test_size=val_size_adjusted, 
-            random_state=random_state,
-            stratify=np.argmax(y_train, axis=1)
+        (X_train, y_train), (X_val, y_val), (X_test, y_test) = self.split_dataset(
+            X, y, test_size=test_size, val_size=val_size, random_state=random_state
         )
         
-        print(f"Training samples: {len(X_train)}")
-        print(f"Validation samples: {len(X_val)}")
-        print(f"Test samples: {len(X_test)}")
-        
         
         class_weights = self._calculate_class_weights(y_train)
         
         
+        best_model_path = os.path.join(run_dir, 'best_model.h5')
         callbacks = [
             
             tf.keras.callbacks.EarlyStopping(
@@ -122,7 +116,7 @@ class EmotionTrainer:
             ),
             
             tf.keras.callbacks.ModelCheckpoint(
-                filepath=os.path.join(self.config['model_dir'], 'best_model.h5'),
+                filepath=best_model_path,
                 monitor='val_accuracy',
                 save_best_only=True,
                 mode='max',
@@ -150,17 +144,58 @@ class EmotionTrainer:
         )
         
         
-        final_model_path = os.path.join(self.config['model_dir'], 'final_model.h5')
+        final_model_path = os.path.join(run_dir, 'final_model.h5')
         self.model.save(final_model_path)
         print(f"\nTraining completed. Model saved to {final_model_path}")
         
         
-        print("\nEvaluating on test set...")
+        self.model.load(best_model_path)
+        print("\nEvaluating best checkpoint on test set...")
         test_loss, test_accuracy = self.model.model.evaluate(X_test, y_test, verbose=0)
         print(f"Test accuracy: {test_accuracy:.4f}")
         
+        
+        version = self.registry.publish(
+            best_model_path,
+            metadata={
+                'test_accuracy': float(test_accuracy),
+                'test_loss': float(test_loss),
+                'class_names': [str(c) for c in self.label_encoder.classes_]
+            },
+            activate=activate
+        )
+        print(f"Published model version {version}")
+        
         return history
     
+    def split_dataset(self, X, y, test_size=0.2, val_size=0.1, random_state=42):
+        
+        
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=random_state, stratify=y
+        )
+        
+        
+        val_size_adjusted = val_size / (1 - test_size)
+        X_train, X_val, y_train, y_val = train_test_split(
+            X_train, y_train, 
+            test_size=val_size_adjusted, 
+            random_state=random_state,
+            stratify=np.argmax(y_train, axis=1)
+        )
+        
+        print(f"Training samples: {len(X_train)}")
+        print(f"Validation samples: {len(X_val)}")
+        print(f"Test samples: {len(X_test)}")
+        
+        return (X_train, y_train), (X_val, y_val), (X_test, y_test)
+    
+    def _create_run_dir(self):
+        
+        run_dir = os.path.join(self.config['model_dir'], 'runs', datetime.now().strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(run_dir, exist_ok=True)
+        return run_dir
+    
     def _calculate_class_weights(self, y):
         
         from sklearn.utils.class_weight import compute_class_weight